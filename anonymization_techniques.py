@@ -7,8 +7,7 @@ import pandas as pd
 import numpy as np
 import hashlib
 import re
-from datetime import datetime, timedelta
-import random
+from synthetic_data import GaussianCopulaSynthesizer
 # from anonymization_library import TextAnonymizer  # Biblioteca não disponível, implementação própria
 import warnings
 warnings.filterwarnings('ignore')
@@ -199,7 +198,7 @@ class DataAnonymizer:
         
         return df_pseudonymized
     
-    def noise_addition(self, df, columns_to_add_noise, noise_level=0.1):
+    def noise_addition(self, df, columns_to_add_noise, noise_level=0.1, random_state=None):
         """
         Técnica de Adição de Ruído
         Adiciona ruído aleatório aos dados numéricos
@@ -208,6 +207,7 @@ class DataAnonymizer:
             df (pd.DataFrame): Dataset original
             columns_to_add_noise (list): Lista de colunas numéricas
             noise_level (float): Nível de ruído (0.1 = 10%)
+            random_state (int): Semente para tornar o ruído reprodutível (opcional)
             
         Returns:
             pd.DataFrame: Dataset com ruído adicionado
@@ -215,6 +215,7 @@ class DataAnonymizer:
         print(f"Implementando Adição de Ruído (nível: {noise_level*100}%)")
         
         df_noisy = df.copy()
+        rng = np.random.default_rng(random_state) if random_state is not None else np.random
         
         for column in columns_to_add_noise:
             if column in df_noisy.columns and df_noisy[column].dtype in ['int64', 'float64']:
@@ -222,7 +223,7 @@ class DataAnonymizer:
                 std_dev = df_noisy[column].std()
                 
                 # Adicionar ruído gaussiano
-                noise = np.random.normal(0, std_dev * noise_level, len(df_noisy))
+                noise = rng.normal(0, std_dev * noise_level, len(df_noisy))
                 df_noisy[column] = df_noisy[column] + noise
                 
                 # Arredondar para manter formato original
@@ -277,7 +278,7 @@ class DataAnonymizer:
         
         return df_masked
     
-    def differential_privacy(self, df, columns_to_privatize, epsilon=1.0):
+    def differential_privacy(self, df, columns_to_privatize, epsilon=1.0, random_state=None):
         """
         Técnica de Privacidade Diferencial
         Adiciona ruído calibrado para garantir privacidade diferencial
@@ -286,6 +287,7 @@ class DataAnonymizer:
             df (pd.DataFrame): Dataset original
             columns_to_privatize (list): Lista de colunas numéricas
             epsilon (float): Parâmetro de privacidade (menor = mais privacidade)
+            random_state (int): Semente para tornar o ruído reprodutível (opcional)
             
         Returns:
             pd.DataFrame: Dataset com privacidade diferencial
@@ -293,6 +295,7 @@ class DataAnonymizer:
         print(f"Implementando Privacidade Diferencial (epsilon={epsilon})")
         
         df_private = df.copy()
+        rng = np.random.default_rng(random_state) if random_state is not None else np.random
         
         for column in columns_to_privatize:
             if column in df_private.columns and df_private[column].dtype in ['int64', 'float64']:
@@ -303,7 +306,7 @@ class DataAnonymizer:
                 scale = sensitivity / epsilon
                 
                 # Adicionar ruído Laplace
-                noise = np.random.laplace(0, scale, len(df_private))
+                noise = rng.laplace(0, scale, len(df_private))
                 df_private[column] = df_private[column] + noise
                 
                 # Arredondar para manter formato original
@@ -315,6 +318,197 @@ class DataAnonymizer:
         print(f"Privacidade diferencial aplicada nas colunas: {columns_to_privatize}")
         
         return df_private
+    
+    def microaggregation(self, df, columns_to_aggregate, k=3, method='mdav', block_size=2000):
+        """
+        Técnica de Microagregação
+        Agrupa registros semelhantes em grupos de pelo menos k e substitui os valores pelo centroide do grupo
+        
+        Args:
+            df (pd.DataFrame): Dataset original
+            columns_to_aggregate (list): Lista de colunas numéricas
+            k (int): Tamanho mínimo de cada grupo
+            method (str): 'univariate' (cada coluna ordenada separadamente) ou 'mdav' (multivariada)
+            block_size (int): Registros por bloco no MDAV (limita o custo quadrático do algoritmo)
+            
+        Returns:
+            pd.DataFrame: Dataset microagregado
+        """
+        print(f"Implementando Microagregação (k={k}, método: {method})")
+        
+        df_aggregated = df.copy()
+        columns = [col for col in columns_to_aggregate
+                   if col in df_aggregated.columns and df_aggregated[col].dtype in ['int64', 'float64']]
+        if not columns:
+            print("Nenhuma coluna numérica encontrada. Retornando dataset original.")
+            return df_aggregated
+        
+        if method == 'univariate':
+            for column in columns:
+                values = df_aggregated[column]
+                valid = values.notna().to_numpy()
+                # Ordenar os valores e formar grupos consecutivos de k registros
+                order = np.argsort(values.to_numpy()[valid], kind='stable')
+                groups = np.empty(len(order), dtype=np.int64)
+                groups[order] = self._sorted_groups(len(order), k)
+                self._replace_by_centroids(df_aggregated, [column], valid, groups)
+        
+        elif method == 'mdav':
+            values = df_aggregated[columns].to_numpy(dtype=float)
+            valid = ~np.isnan(values).any(axis=1)
+            data = values[valid]
+            
+            # Padronizar para que nenhuma coluna domine as distâncias
+            std = data.std(axis=0)
+            std[std == 0] = 1.0
+            data = (data - data.mean(axis=0)) / std
+            
+            # Ordenar pela componente principal e dividir em blocos de registros próximos
+            if len(data) > block_size:
+                _, _, vt = np.linalg.svd(data[np.linspace(0, len(data) - 1, min(len(data), 10000)).astype(int)],
+                                         full_matrices=False)
+                order = np.argsort(data @ vt[0], kind='stable')
+            else:
+                order = np.arange(len(data))
+            n_blocks = max(min(len(data) // block_size, len(data) // k), 1)
+            
+            groups = np.empty(len(data), dtype=np.int64)
+            next_group = 0
+            for block in np.array_split(order, n_blocks):
+                if len(block) == 0:
+                    continue
+                block_groups = self._mdav_groups(data[block], k)
+                groups[block] = block_groups + next_group
+                next_group += block_groups.max() + 1
+            
+            self._replace_by_centroids(df_aggregated, columns, valid, groups)
+            
+            # Registros com nulos em parte das colunas ficam fora do MDAV: cada coluna não nula
+            # é agregada separadamente (univariada) entre eles, para não manter o valor original
+            partial = ~valid & ~np.isnan(values).all(axis=1)
+            if partial.any():
+                print(f"Aviso: {int(partial.sum())} registros com valores nulos foram agregados coluna a coluna")
+                for i, column in enumerate(columns):
+                    present = partial & ~np.isnan(values[:, i])
+                    n_present = int(present.sum())
+                    if n_present >= k:
+                        order = np.argsort(values[present, i], kind='stable')
+                        groups = np.empty(n_present, dtype=np.int64)
+                        groups[order] = self._sorted_groups(n_present, k)
+                        self._replace_by_centroids(df_aggregated, [column], present, groups)
+                    elif n_present > 0:
+                        # Poucos registros para formar um grupo: usar a média de toda a coluna
+                        mean = df[column].mean()
+                        df_aggregated.loc[present, column] = round(mean) if df[column].dtype == 'int64' else round(mean, 2)
+        
+        else:
+            print(f"Método desconhecido: {method}. Retornando dataset original.")
+            return df_aggregated
+        
+        print(f"Microagregação aplicada nas colunas: {columns}")
+        
+        return df_aggregated
+    
+    def synthetic_data(self, df, columns_to_model, n_records=None, epsilon=None, domains=None, random_state=None):
+        """
+        Técnica de Dados Sintéticos
+        Ajusta marginais e uma cópula gaussiana ao dataset e gera registros sintéticos
+        
+        Args:
+            df (pd.DataFrame): Dataset original
+            columns_to_model (list): Lista de colunas numéricas e categóricas modeladas
+            n_records (int): Número de registros sintéticos (padrão: mesmo tamanho do original)
+            epsilon (float): Privacidade diferencial ε no ajuste do modelo (opcional; exige domains)
+            domains (dict): Domínios públicos: (mínimo, máximo) por coluna numérica e lista de
+                categorias por coluna categórica
+            random_state (int): Semente para tornar a geração reprodutível (opcional)
+            
+        Returns:
+            pd.DataFrame: Dataset sintético apenas com as colunas modeladas
+        """
+        print("Implementando Dados Sintéticos (cópula gaussiana)")
+        
+        columns = [col for col in columns_to_model if col in df.columns]
+        if not columns:
+            print("Nenhuma coluna encontrada. Retornando dataset original.")
+            return df.copy()
+        
+        # Sementes inteiras independentes para o ajuste e para a geração
+        seeds = np.random.SeedSequence(random_state).generate_state(2) if random_state is not None else [None, None]
+        seeds = [int(seed) if seed is not None else None for seed in seeds]
+        synthesizer = GaussianCopulaSynthesizer().fit(df, columns, epsilon=epsilon, domains=domains,
+                                                      random_state=seeds[0])
+        df_synthetic = synthesizer.sample(n_records if n_records is not None else len(df), random_state=seeds[1])
+        
+        print(f"Registros sintéticos gerados: {len(df_synthetic)}")
+        print(f"Colunas modeladas: {synthesizer.columns}")
+        
+        return df_synthetic
+    
+    @staticmethod
+    def _sorted_groups(n, k):
+        """
+        Divide n registros já ordenados em grupos consecutivos de k
+        (o último grupo absorve o resto e fica com até 2k-1 registros)
+        """
+        n_groups = max(n // k, 1)
+        return np.minimum(np.arange(n) // k, n_groups - 1)
+    
+    @staticmethod
+    def _mdav_groups(data, k):
+        """
+        Algoritmo MDAV (Maximum Distance to Average Vector)
+        
+        Args:
+            data (np.ndarray): Registros padronizados (n x d)
+            k (int): Tamanho mínimo dos grupos
+            
+        Returns:
+            np.ndarray: Identificador do grupo de cada registro
+        """
+        groups = np.full(len(data), -1, dtype=np.int64)
+        remaining = np.arange(len(data))
+        group_id = 0
+        
+        def take_nearest(point):
+            # Forma um grupo com os k registros restantes mais próximos do ponto
+            nonlocal remaining, group_id
+            distances = ((data[remaining] - point) ** 2).sum(axis=1)
+            nearest = np.argpartition(distances, k - 1)[:k]
+            groups[remaining[nearest]] = group_id
+            group_id += 1
+            remaining = np.delete(remaining, nearest)
+        
+        while len(remaining) >= 3 * k:
+            centroid = data[remaining].mean(axis=0)
+            r = data[remaining[((data[remaining] - centroid) ** 2).sum(axis=1).argmax()]]
+            s = data[remaining[((data[remaining] - r) ** 2).sum(axis=1).argmax()]]
+            take_nearest(r)
+            take_nearest(s)
+        
+        if len(remaining) >= 2 * k:
+            centroid = data[remaining].mean(axis=0)
+            take_nearest(data[remaining[((data[remaining] - centroid) ** 2).sum(axis=1).argmax()]])
+        
+        if len(remaining) > 0:
+            groups[remaining] = group_id
+        
+        return groups
+    
+    @staticmethod
+    def _replace_by_centroids(df, columns, valid, groups):
+        """Substitui os valores válidos de cada coluna pela média do seu grupo"""
+        counts = np.bincount(groups)
+        for column in columns:
+            values = df[column].to_numpy(dtype=float)
+            centroids = np.bincount(groups, weights=values[valid]) / counts
+            values[valid] = centroids[groups]
+            
+            # Arredondar para manter formato original
+            if df[column].dtype == 'int64':
+                df[column] = np.round(values).astype(int)
+            else:
+                df[column] = np.round(values, 2)
 
 def demonstrate_anonymization_techniques():
     """
@@ -398,6 +592,22 @@ def demonstrate_anonymization_techniques():
     df_differential.to_csv('dados_privacidade_diferencial.csv', index=False, encoding='utf-8')
     print("Arquivo salvo: dados_privacidade_diferencial.csv\n")
     
+    # 8. Microagregação
+    print("8. MICROAGREGAÇÃO")
+    print("-" * 50)
+    columns_to_aggregate = ['salario', 'renda_familiar']
+    df_microaggregated = anonymizer.microaggregation(df, columns_to_aggregate, k=3, method='mdav')
+    df_microaggregated.to_csv('dados_microagregados.csv', index=False, encoding='utf-8')
+    print("Arquivo salvo: dados_microagregados.csv\n")
+    
+    # 9. Dados Sintéticos
+    print("9. DADOS SINTÉTICOS")
+    print("-" * 50)
+    columns_to_model = ['idade', 'salario', 'renda_familiar', 'score_credito', 'estado', 'profissao']
+    df_synthetic = anonymizer.synthetic_data(df, columns_to_model, random_state=42)
+    df_synthetic.to_csv('dados_sinteticos.csv', index=False, encoding='utf-8')
+    print("Arquivo salvo: dados_sinteticos.csv\n")
+    
     print("=== DEMONSTRAÇÃO CONCLUÍDA ===")
     print("Todos os arquivos foram salvos com sucesso!")
 
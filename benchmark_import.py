@@ -0,0 +1,76 @@
+"""
+Benchmark de Tempo de Importação
+Mede o tempo de importação de cada módulo do projeto em um interpretador novo
+"""
+
+import sys
+import argparse
+import statistics
+import subprocess
+
+# Módulos medidos pelo benchmark
+MODULES = [
+    'anonymization_techniques',
+    'sample_data_generator',
+    'result_cache',
+    'risk_estimation',
+    'external_anonymization',
+    'data_profiling',
+    'linkage_attack',
+    'synthetic_data',
+    'demo_anonymization'
+]
+
+# Código executado em cada subprocesso: mede apenas a importação do módulo alvo
+TIMING_SNIPPET = (
+    "import time; start = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def measure_import_time(module, repeat=5):
+    """
+    Mede o tempo de importação de um módulo em interpretadores novos
+
+    Args:
+        module (str): Nome do módulo
+        repeat (int): Número de repetições
+
+    Returns:
+        float: Mediana do tempo de importação em milissegundos
+    """
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', TIMING_SNIPPET.format(module=module)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    """
+    Função principal para executar o benchmark
+    """
+    parser = argparse.ArgumentParser(description='Benchmark de tempo de importação')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetições por módulo')
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help='Falha se algum módulo ultrapassar este tempo (ms)')
+    args = parser.parse_args()
+
+    print("=== BENCHMARK DE IMPORTAÇÃO ===")
+    slow_modules = []
+    for module in MODULES:
+        elapsed = measure_import_time(module, args.repeat)
+        print(f"{module:<28} {elapsed:8.1f} ms")
+        if args.max_ms is not None and elapsed > args.max_ms:
+            slow_modules.append(module)
+
+    if slow_modules:
+        print(f"Módulos acima de {args.max_ms} ms: {slow_modules}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""
+Perfil de Dados e Detecção de Dados Pessoais
+Analisa cada coluna antes da anonimização (tipo, nulos, cardinalidade e padrões de PII)
+e sugere uma política de anonimização compatível com o DataAnonymizer
+"""
+
+import os
+import re
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+# Padrões de dados pessoais (o valor inteiro deve corresponder ao padrão)
+PII_PATTERNS = {
+    'email': re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+'),
+    'cpf': re.compile(r'\d{3}\.?\d{3}\.?\d{3}-?\d{2}'),
+    'cartao': re.compile(r'(?:\d[ -]?){12,18}\d'),
+    'rg': re.compile(r'\d{1,2}\.?\d{3}\.?\d{3}-?[\dXx]'),
+    'telefone': re.compile(r'(?:\+55\s?)?(?:\(?0?\d{2,3}\)?[\s-]?)?9?\s?\d{4}[\s-]?\d{4}')
+}
+
+# Colunas numéricas só podem conter documentos validáveis por dígito verificador
+NUMERIC_PII_TYPES = ('cpf', 'cartao')
+
+# Fração mínima dos valores não nulos que deve corresponder ao padrão
+PII_THRESHOLD = 0.8
+
+# Cardinalidade: conjunto exato até este limite, depois apenas o HyperLogLog
+EXACT_CARDINALITY_LIMIT = 10000
+
+# Precisão do HyperLogLog (2^14 registradores, erro padrão de ~0,8%)
+HLL_PRECISION = 14
+HLL_REGISTERS = 1 << HLL_PRECISION
+
+# Faixas usadas pelo DataAnonymizer.generalization
+AGE_RANGE = (0, 100)
+SALARY_RANGE = (0, float('inf'))
+
+# Colunas reconhecidas pelas regras de generalização existentes
+AGE_COLUMNS = {'idade'}
+SALARY_COLUMNS = {'salario', 'renda_familiar'}
+LOCATION_COLUMNS = {'cidade', 'endereco'}
+
+
+def _hll_registers(hashes):
+    """
+    Calcula os registradores HyperLogLog de um array de hashes uint64
+
+    Args:
+        hashes (np.ndarray): Hashes de 64 bits dos valores
+
+    Returns:
+        np.ndarray: Registradores (uint8), combináveis por máximo elemento a elemento
+    """
+    registers = np.zeros(HLL_REGISTERS, dtype=np.uint8)
+    if len(hashes) == 0:
+        return registers
+
+    index = (hashes >> np.uint64(64 - HLL_PRECISION)).astype(np.int64)
+    # 32 bits seguintes ao índice: a posição do primeiro bit 1 define o registrador
+    remainder = ((hashes << np.uint64(HLL_PRECISION)) >> np.uint64(32)).astype(np.float64)
+    rank = np.where(remainder > 0, 32 - np.floor(np.log2(np.maximum(remainder, 1))), 33).astype(np.uint8)
+    np.maximum.at(registers, index, rank)
+    return registers
+
+
+def _hll_estimate(registers):
+    """Estima a cardinalidade a partir dos registradores HyperLogLog"""
+    m = HLL_REGISTERS
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.power(2.0, -registers.astype(np.float64)))
+    zeros = np.count_nonzero(registers == 0)
+    if estimate <= 2.5 * m and zeros > 0:
+        # Correção para cardinalidades pequenas (contagem linear)
+        estimate = m * np.log(m / zeros)
+    return int(round(estimate))
+
+
+def _pii_text(series, values):
+    """
+    Converte os valores não nulos de uma coluna em texto para a detecção de PII
+
+    Colunas numéricas também podem conter CPF, cartão ou telefone armazenados só com
+    dígitos. Uma coluna de inteiros lida de CSV vira float64 quando tem algum nulo, por
+    isso floats com valores inteiros são convertidos sem a parte decimal.
+
+    Returns:
+        pd.Series: Valores como texto, ou None quando a coluna não pode conter PII
+    """
+    if pd.api.types.is_bool_dtype(series) or not pd.api.types.is_numeric_dtype(series):
+        return values.astype(str).str.strip()
+    if pd.api.types.is_integer_dtype(series):
+        return values.astype(str)
+    if pd.api.types.is_float_dtype(series):
+        numbers = values.to_numpy(dtype=float)
+        if np.all(np.isfinite(numbers)) and np.all(numbers % 1 == 0) and np.all(np.abs(numbers) < 2 ** 63):
+            return values.astype('Int64').astype(str)
+    return None
+
+
+def _digit_matrix(digits, length):
+    """Converte strings de dígitos com o mesmo tamanho em uma matriz (n, length) de inteiros"""
+    buffer = np.frombuffer(''.join(digits).encode('ascii'), dtype=np.uint8)
+    return buffer.reshape(-1, length).astype(np.int64) - ord('0')
+
+
+def _valid_cpf(digits):
+    """Indica quais valores têm 11 dígitos com os dois dígitos verificadores do CPF corretos"""
+    valid = pd.Series(False, index=digits.index)
+    mask = digits.str.len() == 11
+    if mask.any():
+        d = _digit_matrix(digits[mask], 11)
+        first = (d[:, :9] @ np.arange(10, 1, -1)) * 10 % 11 % 10
+        second = (d[:, :10] @ np.arange(11, 1, -1)) * 10 % 11 % 10
+        repeated = (d == d[:, :1]).all(axis=1)
+        valid[mask] = (d[:, 9] == first) & (d[:, 10] == second) & ~repeated
+    return valid
+
+
+def _valid_luhn(digits):
+    """Indica quais valores têm de 13 a 19 dígitos e passam no algoritmo de Luhn (cartões)"""
+    valid = pd.Series(False, index=digits.index)
+    lengths = digits.str.len()
+    for length in lengths[(lengths >= 13) & (lengths <= 19)].unique():
+        mask = lengths == length
+        d = _digit_matrix(digits[mask], int(length))[:, ::-1]
+        doubled = d[:, 1::2] * 2
+        total = d[:, ::2].sum(axis=1) + (doubled - 9 * (doubled > 9)).sum(axis=1)
+        valid[mask] = total % 10 == 0
+    return valid
+
+
+def _count_pii(text, numeric):
+    """
+    Conta os valores que correspondem a cada padrão de PII
+
+    CPF e cartão precisam passar na validação dos dígitos verificadores. Números sem
+    formatação não contam como telefone: com 10 dígitos colidem com timestamps Unix e
+    com 11 dígitos com CPF. Em colunas numéricas só CPF e cartão são procurados, pois
+    RG e telefone sem formatação não têm como ser distinguidos de chaves numéricas.
+
+    Args:
+        text (pd.Series): Valores não nulos como texto
+        numeric (bool): Se os valores vieram de uma coluna numérica
+
+    Returns:
+        dict: Quantidade de correspondências por tipo de PII
+    """
+    digits = text.str.replace(r'[^0-9]', '', regex=True)
+    bare = text.str.fullmatch(r'[0-9]+')
+    validators = {
+        'cpf': _valid_cpf,
+        'cartao': _valid_luhn,
+        'telefone': lambda _: ~bare
+    }
+
+    counts = {}
+    for pii_type, pattern in PII_PATTERNS.items():
+        if numeric and pii_type not in NUMERIC_PII_TYPES:
+            continue
+        matches = text.str.fullmatch(pattern)
+        if pii_type in validators and matches.any():
+            matches &= validators[pii_type](digits)
+        counts[pii_type] = int(matches.sum())
+    return counts
+
+
+def _merge_dtype(first, second):
+    """Tipo combinado de dois blocos: inteiro e float viram float64 (inteiros com nulos)"""
+    if first == second:
+        return first
+    numeric = ('int', 'uint', 'float')
+    if first.startswith(numeric) and second.startswith(numeric):
+        return 'float64' if 'float' in (first[:5], second[:5]) else 'int64'
+    return 'object'
+
+
+def _profile_chunk(chunk):
+    """
+    Calcula as estatísticas parciais de um bloco de registros
+
+    Args:
+        chunk (pd.DataFrame): Bloco de registros
+
+    Returns:
+        dict: Estatísticas parciais por coluna
+    """
+    partial = {}
+    for column in chunk.columns:
+        series = chunk[column]
+        values = series.dropna()
+        text = _pii_text(series, values)
+        # Floats inteiros são contados como inteiros, para coincidir com blocos int64 da mesma coluna
+        hashed = values.astype('int64') if text is not None and pd.api.types.is_float_dtype(series) else values
+        hashes = np.unique(pd.util.hash_pandas_object(hashed, index=False).to_numpy())
+        stats = {
+            'tipo': str(series.dtype),
+            'registros': len(series),
+            'nulos': int(len(series) - len(values)),
+            'hashes': hashes if len(hashes) <= EXACT_CARDINALITY_LIMIT else None,
+            'hll': _hll_registers(hashes),
+            'correspondencias': {}
+        }
+
+        is_numeric = pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+        if is_numeric:
+            stats['minimo'] = values.min() if len(values) else np.nan
+            stats['maximo'] = values.max() if len(values) else np.nan
+
+        if text is not None:
+            stats['correspondencias'] = _count_pii(text, is_numeric)
+
+        partial[column] = stats
+    return partial
+
+
+def _merge_partials(total, partial):
+    """Combina as estatísticas parciais de um bloco no acumulado"""
+    for column, stats in partial.items():
+        if column not in total:
+            total[column] = stats
+            continue
+
+        merged = total[column]
+        merged['tipo'] = _merge_dtype(merged['tipo'], stats['tipo'])
+        merged['registros'] += stats['registros']
+        merged['nulos'] += stats['nulos']
+        # Conjunto exato só enquanto for pequeno; acima do limite vale o HyperLogLog
+        if merged['hashes'] is not None and stats['hashes'] is not None:
+            merged['hashes'] = np.union1d(merged['hashes'], stats['hashes'])
+            if len(merged['hashes']) > EXACT_CARDINALITY_LIMIT:
+                merged['hashes'] = None
+        else:
+            merged['hashes'] = None
+        np.maximum(merged['hll'], stats['hll'], out=merged['hll'])
+        for pii_type, count in stats['correspondencias'].items():
+            merged['correspondencias'][pii_type] = merged['correspondencias'].get(pii_type, 0) + count
+        if 'minimo' in stats:
+            merged['minimo'] = np.nanmin([merged.get('minimo', np.nan), stats['minimo']])
+            merged['maximo'] = np.nanmax([merged.get('maximo', np.nan), stats['maximo']])
+    return total
+
+
+def _finalize(total):
+    """
+    Converte as estatísticas acumuladas no perfil final
+
+    Returns:
+        pd.DataFrame: Uma linha por coluna
+    """
+    rows = []
+    for column, stats in total.items():
+        non_null = stats['registros'] - stats['nulos']
+        rates = {
+            pii_type: count / non_null if non_null else 0.0
+            for pii_type, count in stats['correspondencias'].items()
+        }
+        detected = max(rates, key=rates.get) if rates else None
+        if detected is not None and rates[detected] < PII_THRESHOLD:
+            detected = None
+
+        rows.append({
+            'coluna': column,
+            'tipo': stats['tipo'],
+            'registros': stats['registros'],
+            'taxa_nulos': stats['nulos'] / stats['registros'] if stats['registros'] else 0.0,
+            'cardinalidade': len(stats['hashes']) if stats['hashes'] is not None else _hll_estimate(stats['hll']),
+            'cardinalidade_aproximada': stats['hashes'] is None,
+            'minimo': stats.get('minimo', np.nan),
+            'maximo': stats.get('maximo', np.nan),
+            'pii_detectado': detected,
+            'taxa_pii': rates[detected] if detected else 0.0
+        })
+
+    return pd.DataFrame(rows).set_index('coluna')
+
+
+class DataProfiler:
+    """
+    Classe para gerar o perfil das colunas e sugerir políticas de anonimização
+    """
+
+    def __init__(self, n_jobs=None, chunksize=100000):
+        """
+        Args:
+            n_jobs (int): Número de processos para arquivos (padrão: número de CPUs)
+            chunksize (int): Registros por bloco na leitura de arquivos
+        """
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.chunksize = chunksize
+
+    def profile(self, df):
+        """
+        Gera o perfil de um DataFrame em memória
+
+        Args:
+            df (pd.DataFrame): Dataset original
+
+        Returns:
+            pd.DataFrame: Perfil com uma linha por coluna
+        """
+        return _finalize(_profile_chunk(df))
+
+    def profile_csv(self, path, **read_csv_kwargs):
+        """
+        Gera o perfil de um arquivo CSV lendo em blocos e processando-os em paralelo
+
+        Args:
+            path (str): Caminho do CSV
+            **read_csv_kwargs: Parâmetros adicionais para pd.read_csv
+
+        Returns:
+            pd.DataFrame: Perfil com uma linha por coluna
+        """
+        print(f"Gerando perfil de {path} com {self.n_jobs} processos")
+
+        total = {}
+        reader = pd.read_csv(path, chunksize=self.chunksize, **read_csv_kwargs)
+
+        if self.n_jobs == 1:
+            for chunk in reader:
+                _merge_partials(total, _profile_chunk(chunk))
+            return _finalize(total)
+
+        # Mantém no máximo dois blocos por processo em memória ao mesmo tempo
+        with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+            pending = []
+            for chunk in reader:
+                pending.append(executor.submit(_profile_chunk, chunk))
+                if len(pending) >= 2 * self.n_jobs:
+                    _merge_partials(total, pending.pop(0).result())
+            for future in pending:
+                _merge_partials(total, future.result())
+
+        return _finalize(total)
+
+    def suggest_policy(self, profile):
+        """
+        Sugere regras de anonimização a partir do perfil
+
+        Args:
+            profile (pd.DataFrame): Perfil gerado por profile/profile_csv
+
+        Returns:
+            dict: Parâmetros para suppression, data_masking e generalization, além de avisos
+        """
+        policy = {
+            'suppression': [],
+            'data_masking': {},
+            'generalization': {},
+            'avisos': []
+        }
+
+        for column, row in profile.iterrows():
+            pii_type = row['pii_detectado']
+
+            if pii_type in ('cpf', 'rg', 'cartao'):
+                policy['suppression'].append(column)
+            elif pii_type in ('email', 'telefone'):
+                policy['data_masking'][column] = {'type': 'email' if pii_type == 'email' else 'phone'}
+
+            if pii_type and row['taxa_nulos'] > 0:
+                policy['avisos'].append(
+                    f"{column}: {row['taxa_nulos']:.1%} de valores nulos em coluna com {pii_type}"
+                )
+
+            if column in AGE_COLUMNS:
+                policy['generalization'][column] = {'type': 'age_ranges'}
+                self._check_range(policy, column, row, AGE_RANGE)
+            elif column in SALARY_COLUMNS:
+                policy['generalization'][column] = {'type': 'salary_ranges'}
+                self._check_range(policy, column, row, SALARY_RANGE)
+            elif column in LOCATION_COLUMNS:
+                policy['generalization'][column] = {'type': 'location_generalization'}
+
+        return policy
+
+    @staticmethod
+    def _check_range(policy, column, row, value_range):
+        """Avisa quando a coluna tem nulos ou valores fora das faixas de generalização"""
+        low, high = value_range
+        if pd.isna(row['minimo']):
+            policy['avisos'].append(f"{column}: coluna não numérica, generalização por faixas não se aplica")
+            return
+        if row['minimo'] <= low or row['maximo'] > high:
+            policy['avisos'].append(
+                f"{column}: valores entre {row['minimo']} e {row['maximo']} fora das faixas ({low}, {high}]"
+            )
+        if row['taxa_nulos'] > 0:
+            policy['avisos'].append(f"{column}: {row['taxa_nulos']:.1%} de valores nulos permanecerão nulos")
@@ -3,28 +3,62 @@ Demonstração Completa de Anonimização de Dados
 Script principal para executar todas as técnicas de anonimização
 """
 
+import os
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+from functools import lru_cache
 from anonymization_techniques import DataAnonymizer
 from sample_data_generator import generate_sensitive_dataset
+from result_cache import ResultCache
 import warnings
 warnings.filterwarnings('ignore')
 
-# Configurar estilo dos gráficos
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
+@lru_cache(maxsize=None)
+def _load_pyplot():
+    """
+    Importa matplotlib/seaborn sob demanda e configura o estilo dos gráficos
+    
+    Returns:
+        module: matplotlib.pyplot
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
+    # Configurar estilo dos gráficos
+    plt.style.use('seaborn-v0_8')
+    sns.set_palette("husl")
+    return plt
 
 class AnonymizationDemo:
     """
     Classe para demonstrar técnicas de anonimização com visualizações
     """
     
-    def __init__(self):
+    def __init__(self, cache=None):
+        """
+        Args:
+            cache (ResultCache): Cache de resultados das técnicas (opcional)
+        """
         self.anonymizer = DataAnonymizer()
+        self.cache = cache
         self.results = {}
     
+    def apply_technique(self, technique, df, *args, **kwargs):
+        """
+        Aplica uma técnica do DataAnonymizer, usando o cache quando configurado
+        
+        Args:
+            technique (str): Nome do método (ex.: 'k_anonymity')
+            df (pd.DataFrame): Dataset original
+            *args, **kwargs: Parâmetros repassados para a técnica
+            
+        Returns:
+            pd.DataFrame: Dataset anonimizado
+        """
+        if self.cache is None:
+            return getattr(self.anonymizer, technique)(df, *args, **kwargs)
+        return self.cache.run(self.anonymizer, technique, df, *args, **kwargs)
+    
     def generate_comparison_report(self, original_df, anonymized_dfs):
         """
         Gera relatório comparativo entre dados originais e anonimizados
@@ -64,6 +98,16 @@ class AnonymizationDemo:
                     else:
                         print(f"{technique} - Tipo: {df[col].dtype} (não numérico após anonimização)")
         
+        # Perda de informação nas colunas financeiras
+        print(f"\nPerda de informação (SSE/SST, menor = mais utilidade)")
+        for col in ['salario', 'renda_familiar']:
+            if col not in original_df.columns:
+                continue
+            for technique, df in anonymized_dfs.items():
+                loss = self.information_loss(original_df, df, col)
+                if loss is not None:
+                    print(f"{col} - {technique}: {loss:.4f}")
+        
         # Análise de privacidade
         print(f"\n3. ANÁLISE DE PRIVACIDADE")
         print("-" * 40)
@@ -78,6 +122,31 @@ class AnonymizationDemo:
                 unique_combinations = df[quasi_identifiers].drop_duplicates()
                 print(f"{technique} - Combinações únicas: {len(unique_combinations)}")
     
+    @staticmethod
+    def information_loss(original_df, anonymized_df, column):
+        """
+        Calcula a perda de informação de uma coluna numérica (SSE/SST)
+        
+        Args:
+            original_df (pd.DataFrame): Dataset original
+            anonymized_df (pd.DataFrame): Dataset anonimizado com os mesmos registros
+            column (str): Coluna numérica
+            
+        Returns:
+            float: Soma dos erros quadráticos dividida pela soma total dos quadrados,
+                ou None se a coluna não puder ser comparada
+        """
+        if (column not in anonymized_df.columns or len(anonymized_df) != len(original_df)
+                or anonymized_df[column].dtype not in ['int64', 'float64']):
+            return None
+        
+        original = original_df[column].to_numpy(dtype=float)
+        anonymized = anonymized_df[column].to_numpy(dtype=float)
+        sst = np.nansum((original - np.nanmean(original)) ** 2)
+        if sst == 0:
+            return None
+        return np.nansum((original - anonymized) ** 2) / sst
+    
     def create_visualizations(self, original_df, anonymized_dfs):
         """
         Cria visualizações comparativas
@@ -89,6 +158,8 @@ class AnonymizationDemo:
         print("\n4. CRIANDO VISUALIZAÇÕES")
         print("-" * 40)
         
+        plt = _load_pyplot()
+        
         # Configurar figura
         fig, axes = plt.subplots(2, 2, figsize=(15, 12))
         fig.suptitle('Comparação: Dados Originais vs Anonimizados', fontsize=16, fontweight='bold')
@@ -167,7 +238,8 @@ class AnonymizationDemo:
             'Pseudoanonimização': 0.9,
             'Mascaramento': 0.5,
             'Adição de Ruído': 0.4,
-            'Privacidade Diferencial': 0.3
+            'Privacidade Diferencial': 0.3,
+            'Microagregação': 0.7
         }
         
         privacy_scores = {
@@ -177,13 +249,15 @@ class AnonymizationDemo:
             'Pseudoanonimização': 0.6,
             'Mascaramento': 0.8,
             'Adição de Ruído': 0.5,
-            'Privacidade Diferencial': 0.9
+            'Privacidade Diferencial': 0.9,
+            'Microagregação': 0.7
         }
         
         # Filtrar apenas técnicas que foram aplicadas
         applied_techniques = [tech for tech in utility_scores.keys() if tech in anonymized_dfs]
         
         if applied_techniques:
+            plt = _load_pyplot()
             fig, ax = plt.subplots(1, 1, figsize=(10, 8))
             
             for technique in applied_techniques:
@@ -204,9 +278,12 @@ class AnonymizationDemo:
             plt.savefig('utilidade_vs_privacidade.png', dpi=300, bbox_inches='tight')
             print("Gráfico salvo: utilidade_vs_privacidade.png")
     
-    def run_complete_demo(self):
+    def run_complete_demo(self, regenerate_data=False):
         """
         Executa demonstração completa de anonimização
+        
+        Args:
+            regenerate_data (bool): Gera um novo dataset mesmo que dados_sensiveis_original.csv já exista
         """
         print("=" * 80)
         print("DEMONSTRAÇÃO COMPLETA DE ANONIMIZAÇÃO DE DADOS")
@@ -216,9 +293,14 @@ class AnonymizationDemo:
         # 1. Gerar dados de exemplo
         print("\n1. GERANDO DADOS DE EXEMPLO")
         print("-" * 40)
-        original_df = generate_sensitive_dataset(500)  # Dataset menor para demonstração
-        original_df.to_csv('dados_sensiveis_original.csv', index=False, encoding='utf-8')
-        print(f"Dataset gerado: {len(original_df)} registros")
+        if regenerate_data or not os.path.exists('dados_sensiveis_original.csv'):
+            original_df = generate_sensitive_dataset(500)  # Dataset menor para demonstração
+            original_df.to_csv('dados_sensiveis_original.csv', index=False, encoding='utf-8')
+            print(f"Dataset gerado: {len(original_df)} registros")
+        
+        # Sempre ler do CSV para que execuções repetidas vejam o mesmo conteúdo (e reaproveitem o cache)
+        original_df = pd.read_csv('dados_sensiveis_original.csv')
+        print(f"Dataset carregado: {len(original_df)} registros")
         
         # 2. Aplicar técnicas de anonimização
         print("\n2. APLICANDO TÉCNICAS DE ANONIMIZAÇÃO")
@@ -229,7 +311,7 @@ class AnonymizationDemo:
         # K-Anonimidade
         print("\nAplicando K-Anonimidade...")
         quasi_identifiers = ['idade', 'cidade', 'estado']
-        df_k_anon = self.anonymizer.k_anonymity(original_df, quasi_identifiers, k=3)
+        df_k_anon = self.apply_technique('k_anonymity', original_df, quasi_identifiers, k=3)
         anonymized_dfs['K-Anonimidade'] = df_k_anon
         
         # Generalização
@@ -240,19 +322,19 @@ class AnonymizationDemo:
             'cidade': {'type': 'location_generalization'},
             'endereco': {'type': 'location_generalization'}
         }
-        df_generalized = self.anonymizer.generalization(original_df, generalization_rules)
+        df_generalized = self.apply_technique('generalization', original_df, generalization_rules)
         anonymized_dfs['Generalização'] = df_generalized
         
         # Supressão
         print("\nAplicando Supressão...")
         columns_to_suppress = ['nome_completo', 'cpf', 'rg', 'numero_cartao']
-        df_suppressed = self.anonymizer.suppression(original_df, columns_to_suppress)
+        df_suppressed = self.apply_technique('suppression', original_df, columns_to_suppress)
         anonymized_dfs['Supressão'] = df_suppressed
         
         # Pseudoanonimização
         print("\nAplicando Pseudoanonimização...")
         columns_to_pseudonymize = ['email', 'telefone']
-        df_pseudonymized = self.anonymizer.pseudonymization(original_df, columns_to_pseudonymize)
+        df_pseudonymized = self.apply_technique('pseudonymization', original_df, columns_to_pseudonymize)
         anonymized_dfs['Pseudoanonimização'] = df_pseudonymized
         
         # Mascaramento
@@ -262,21 +344,27 @@ class AnonymizationDemo:
             'telefone': {'type': 'phone'},
             'cpf': {'type': 'cpf'}
         }
-        df_masked = self.anonymizer.data_masking(original_df, masking_rules)
+        df_masked = self.apply_technique('data_masking', original_df, masking_rules)
         anonymized_dfs['Mascaramento'] = df_masked
         
         # Adição de Ruído
         print("\nAplicando Adição de Ruído...")
         columns_to_add_noise = ['salario', 'renda_familiar', 'score_credito']
-        df_noisy = self.anonymizer.noise_addition(original_df, columns_to_add_noise, noise_level=0.05)
+        df_noisy = self.apply_technique('noise_addition', original_df, columns_to_add_noise, noise_level=0.05)
         anonymized_dfs['Adição de Ruído'] = df_noisy
         
         # Privacidade Diferencial
         print("\nAplicando Privacidade Diferencial...")
         columns_to_privatize = ['salario', 'renda_familiar']
-        df_differential = self.anonymizer.differential_privacy(original_df, columns_to_privatize, epsilon=1.0)
+        df_differential = self.apply_technique('differential_privacy', original_df, columns_to_privatize, epsilon=1.0)
         anonymized_dfs['Privacidade Diferencial'] = df_differential
         
+        # Microagregação
+        print("\nAplicando Microagregação...")
+        columns_to_aggregate = ['salario', 'renda_familiar']
+        df_microaggregated = self.apply_technique('microaggregation', original_df, columns_to_aggregate, k=3)
+        anonymized_dfs['Microagregação'] = df_microaggregated
+        
         # 3. Salvar resultados
         print("\n3. SALVANDO RESULTADOS")
         print("-" * 40)
@@ -315,7 +403,7 @@ def main():
     """
     Função principal para executar a demonstração
     """
-    demo = AnonymizationDemo()
+    demo = AnonymizationDemo(cache=ResultCache())
     demo.run_complete_demo()
 
 if __name__ == "__main__":
@@ -0,0 +1,245 @@
+"""
+K-Anonimidade e L-Diversidade em Memória Externa
+Aplica k-anonimidade/l-diversidade em arquivos CSV maiores que a memória disponível,
+particionando os registros em disco por hash dos quasi-identificadores
+"""
+
+import os
+import math
+import shutil
+import tempfile
+import pandas as pd
+
+# Separador usado para compor a chave das classes de equivalência
+KEY_SEPARATOR = '\x1f'
+
+# Chave de hash fixa (16 bytes) para que a partição de uma classe seja estável entre chunks;
+# cada nível de re-particionamento usa uma chave diferente
+HASH_KEY_TEMPLATE = 'kanon-part-{:05d}'
+
+# Limite de arquivos de partição criados em disco por nível
+MAX_PARTITIONS = 4096
+
+
+class ExternalKAnonymizer:
+    """
+    Classe para aplicar k-anonimidade e l-diversidade fora da memória
+
+    Os registros são distribuídos em arquivos de partição no disco local de acordo com
+    o hash da tupla de quasi-identificadores. Como todos os registros de uma mesma classe
+    de equivalência caem na mesma partição, cada partição pode ser contada de forma
+    independente, com uso de memória limitado pelo orçamento configurado. Partições que
+    ainda excedem o orçamento (por exemplo, quando o número de partições atinge
+    MAX_PARTITIONS) são re-particionadas recursivamente com outra chave de hash.
+    """
+
+    def __init__(self, memory_budget_mb=512, spill_dir=None):
+        """
+        Args:
+            memory_budget_mb (int): Orçamento aproximado de memória em MB
+            spill_dir (str): Diretório para os arquivos de partição (padrão: diretório temporário do sistema)
+        """
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.spill_dir = spill_dir
+
+    def _estimate_layout(self, input_path, sample_rows=1000):
+        """
+        Estima o tamanho dos chunks de leitura e o número de partições
+
+        Args:
+            input_path (str): Caminho do CSV de entrada
+            sample_rows (int): Número de linhas usadas na amostra
+
+        Returns:
+            tuple: (linhas por chunk, número de partições, tamanho máximo em disco de uma partição)
+        """
+        sample = pd.read_csv(input_path, nrows=sample_rows, dtype=str, keep_default_na=False)
+        if len(sample) == 0:
+            return 1, 1, float('inf')
+
+        # Bytes por registro em memória e em disco, estimados pela amostra
+        memory_per_row = max(sample.memory_usage(deep=True).sum() / len(sample), 1)
+        with open(input_path, 'rb') as f:
+            f.readline()
+            disk_bytes = sum(len(f.readline()) for _ in range(len(sample)))
+        disk_per_row = max(disk_bytes / len(sample), 1)
+
+        estimated_rows = os.path.getsize(input_path) / disk_per_row
+
+        # Metade do orçamento para o chunk em leitura, metade para o estado de uma partição
+        chunk_rows = max(int(self.memory_budget / 2 / memory_per_row), 1)
+        n_partitions = max(math.ceil(estimated_rows * memory_per_row / (self.memory_budget / 2)), 1)
+        if n_partitions > MAX_PARTITIONS:
+            print(f"Aviso: {n_partitions} partições estimadas, limitadas a {MAX_PARTITIONS}; "
+                  "partições acima do orçamento serão re-particionadas")
+            n_partitions = MAX_PARTITIONS
+        max_partition_bytes = self.memory_budget / 2 / memory_per_row * disk_per_row
+
+        return chunk_rows, n_partitions, max_partition_bytes
+
+    @staticmethod
+    def _class_keys(chunk, quasi_identifiers):
+        """Cria a chave textual da classe de equivalência de cada registro"""
+        keys = chunk[quasi_identifiers[0]]
+        for column in quasi_identifiers[1:]:
+            keys = keys + KEY_SEPARATOR + chunk[column]
+        return keys
+
+    def _spill(self, input_path, quasi_identifiers, partition_dir, chunk_rows, n_partitions, depth=0):
+        """
+        Primeira passagem: distribui os registros em arquivos de partição
+
+        Args:
+            depth (int): Nível de re-particionamento, que define a chave de hash
+
+        Returns:
+            tuple: (lista de caminhos das partições, total de registros lidos)
+        """
+        paths = [os.path.join(partition_dir, f'particao_{i:05d}.csv') for i in range(n_partitions)]
+        total_rows = 0
+
+        reader = pd.read_csv(input_path, chunksize=chunk_rows, dtype=str, keep_default_na=False)
+        for chunk in reader:
+            total_rows += len(chunk)
+            keys = self._class_keys(chunk, quasi_identifiers)
+            hashes = pd.util.hash_pandas_object(keys, index=False, hash_key=HASH_KEY_TEMPLATE.format(depth))
+            partition_ids = hashes.to_numpy() % n_partitions
+
+            for partition_id, part in chunk.groupby(partition_ids):
+                path = paths[partition_id]
+                part.to_csv(path, mode='a', header=not os.path.exists(path), index=False, encoding='utf-8')
+
+        return [p for p in paths if os.path.exists(p)], total_rows
+
+    def _bounded_partitions(self, paths, quasi_identifiers, chunk_rows, max_partition_bytes, depth=0):
+        """
+        Re-particiona recursivamente as partições maiores que o orçamento de memória
+
+        Uma partição que não se divide com a nova chave de hash contém uma única classe
+        (ou classes que colidem em todos os níveis) e é mantida como está: a contagem
+        guarda apenas uma entrada por classe.
+
+        Yields:
+            str: Caminho de cada partição a ser processada
+        """
+        for path in paths:
+            size = os.path.getsize(path)
+            if size <= max_partition_bytes:
+                yield path
+                continue
+
+            sub_dir = os.path.splitext(path)[0]
+            os.makedirs(sub_dir)
+            n_sub = min(math.ceil(2 * size / max_partition_bytes), MAX_PARTITIONS)
+            sub_paths, _ = self._spill(path, quasi_identifiers, sub_dir, chunk_rows, n_sub, depth + 1)
+            os.remove(path)
+
+            if len(sub_paths) == 1:
+                yield sub_paths[0]
+            else:
+                yield from self._bounded_partitions(
+                    sub_paths, quasi_identifiers, chunk_rows, max_partition_bytes, depth + 1
+                )
+
+    def _valid_keys(self, partition_path, quasi_identifiers, k, sensitive_attribute, l, chunk_rows):
+        """
+        Conta as classes de equivalência de uma partição
+
+        Returns:
+            tuple: (índice com as chaves válidas, número total de classes na partição)
+        """
+        counts = pd.Series(dtype='int64')
+        distinct_pairs = None
+
+        reader = pd.read_csv(partition_path, chunksize=chunk_rows, dtype=str, keep_default_na=False)
+        for chunk in reader:
+            keys = self._class_keys(chunk, quasi_identifiers)
+            counts = counts.add(keys.value_counts(), fill_value=0)
+
+            if sensitive_attribute is not None:
+                pairs = pd.DataFrame({'chave': keys, 'sensivel': chunk[sensitive_attribute]}).drop_duplicates()
+                distinct_pairs = pairs if distinct_pairs is None else pd.concat([distinct_pairs, pairs]).drop_duplicates()
+
+        valid = counts >= k
+        if distinct_pairs is not None:
+            diversity = distinct_pairs.groupby('chave').size().reindex(counts.index, fill_value=0)
+            valid &= diversity >= l
+
+        return counts.index[valid], len(counts)
+
+    def run(self, input_path, output_path, quasi_identifiers, k=3, sensitive_attribute=None, l=1):
+        """
+        Aplica k-anonimidade (e opcionalmente l-diversidade) em um CSV fora da memória
+
+        Os registros de saída mantêm o texto original do CSV, mas ficam agrupados
+        por partição, e não na ordem do arquivo de entrada.
+
+        Args:
+            input_path (str): Caminho do CSV original
+            output_path (str): Caminho do CSV anonimizado
+            quasi_identifiers (list): Lista de atributos quasi-identificadores
+            k (int): Valor mínimo de k para anonimidade
+            sensitive_attribute (str): Atributo sensível para l-diversidade (opcional)
+            l (int): Valor mínimo de diversidade
+
+        Returns:
+            dict: Estatísticas do processamento
+        """
+        print(f"Implementando K-Anonimidade externa com k={k}" +
+              (f" e L-Diversidade com l={l}" if sensitive_attribute else ""))
+
+        header = pd.read_csv(input_path, nrows=0).columns
+        missing = [col for col in quasi_identifiers + ([sensitive_attribute] if sensitive_attribute else [])
+                   if col not in header]
+        if missing:
+            raise ValueError(f"Colunas não encontradas no arquivo: {missing}")
+
+        chunk_rows, n_partitions, max_partition_bytes = self._estimate_layout(input_path)
+        print(f"Partições: {n_partitions}, registros por chunk: {chunk_rows}")
+
+        partition_dir = tempfile.mkdtemp(prefix='kanon_', dir=self.spill_dir)
+        total_classes = 0
+        valid_classes = 0
+        kept_rows = 0
+        processed_partitions = 0
+
+        try:
+            partition_paths, total_rows = self._spill(
+                input_path, quasi_identifiers, partition_dir, chunk_rows, n_partitions
+            )
+
+            # Segunda passagem: emitir apenas registros de classes válidas
+            pd.DataFrame(columns=header).to_csv(output_path, index=False, encoding='utf-8')
+            for path in self._bounded_partitions(partition_paths, quasi_identifiers, chunk_rows,
+                                                 max_partition_bytes):
+                processed_partitions += 1
+                valid_keys, n_classes = self._valid_keys(
+                    path, quasi_identifiers, k, sensitive_attribute, l, chunk_rows
+                )
+                total_classes += n_classes
+                valid_classes += len(valid_keys)
+                if len(valid_keys) == 0:
+                    continue
+
+                reader = pd.read_csv(path, chunksize=chunk_rows, dtype=str, keep_default_na=False)
+                for chunk in reader:
+                    kept = chunk[self._class_keys(chunk, quasi_identifiers).isin(valid_keys)]
+                    kept.to_csv(output_path, mode='a', header=False, index=False, encoding='utf-8')
+                    kept_rows += len(kept)
+        finally:
+            shutil.rmtree(partition_dir, ignore_errors=True)
+
+        if processed_partitions > len(partition_paths):
+            print(f"Partições re-particionadas: {processed_partitions} partições processadas")
+        print(f"Registros originais: {total_rows}")
+        print(f"Registros após K-anonimidade externa: {kept_rows}")
+        print(f"Registros removidos: {total_rows - kept_rows}")
+
+        return {
+            'registros_originais': total_rows,
+            'registros_mantidos': kept_rows,
+            'registros_removidos': total_rows - kept_rows,
+            'classes': total_classes,
+            'classes_validas': valid_classes,
+            'particoes': processed_partitions
+        }
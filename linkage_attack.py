@@ -0,0 +1,184 @@
+"""
+Simulador de Ataque de Vinculação de Registros
+Mede a facilidade de reidentificar registros anonimizados cruzando-os com uma base auxiliar
+"""
+
+import numpy as np
+import pandas as pd
+from anonymization_techniques import DataAnonymizer
+
+
+class LinkageAttackSimulator:
+    """
+    Classe para simular ataques de vinculação contra datasets anonimizados
+
+    A coluna de identificação (id) é usada apenas para conferir se o registro vinculado
+    pelo atacante é de fato o mesmo titular; ela nunca participa da comparação.
+    Para escalar a milhões de registros, os pares candidatos são gerados apenas dentro
+    de blocos (registros com os mesmos valores nas colunas de bloqueio), e não por
+    comparação de todos contra todos.
+    """
+
+    def __init__(self, id_column='id', chunksize=50000, max_block_size=10000, max_pairs=5000000):
+        """
+        Args:
+            id_column (str): Coluna usada como verdade de referência
+            chunksize (int): Registros anonimizados processados por bloco de junção
+            max_block_size (int): Tamanho máximo de um bloco da base auxiliar; blocos maiores
+                indicam colunas de bloqueio pouco seletivas e são ignorados
+            max_pairs (int): Limite aproximado de pares candidatos gerados por junção
+        """
+        self.id_column = id_column
+        self.chunksize = chunksize
+        self.max_block_size = max_block_size
+        self.max_pairs = max_pairs
+        self.anonymizer = DataAnonymizer()
+
+    def auxiliary_from_original(self, original_df, columns, fraction=0.5, random_state=None):
+        """
+        Monta uma base auxiliar com parte dos titulares do dataset original
+
+        Simula um atacante que conhece alguns atributos de uma fração das pessoas.
+
+        Args:
+            original_df (pd.DataFrame): Dataset original
+            columns (list): Atributos conhecidos pelo atacante
+            fraction (float): Fração dos titulares presentes na base auxiliar
+            random_state (int): Semente da amostragem
+
+        Returns:
+            pd.DataFrame: Base auxiliar
+        """
+        return original_df[[self.id_column] + columns].sample(frac=fraction, random_state=random_state)
+
+    def _report(self, attack, n_records, linked, correct, candidate_pairs):
+        """Imprime e retorna as métricas do ataque"""
+        rate = correct / n_records if n_records else 0.0
+
+        print(f"Registros anonimizados: {n_records}")
+        print(f"Pares candidatos comparados: {candidate_pairs}")
+        print(f"Registros vinculados: {linked}")
+        print(f"Registros reidentificados corretamente: {correct} ({rate:.1%})")
+
+        return {
+            'ataque': attack,
+            'registros_anonimizados': n_records,
+            'pares_candidatos': candidate_pairs,
+            'registros_vinculados': linked,
+            'registros_reidentificados': correct,
+            'taxa_reidentificacao': rate
+        }
+
+    def pseudonym_attack(self, anonymized_df, auxiliary_df, columns):
+        """
+        Ataque de dicionário contra a pseudoanonimização
+
+        Como o hash usado pela pseudoanonimização não tem chave, o atacante aplica a mesma
+        função aos valores da base auxiliar e faz uma junção exata pelos pseudônimos.
+        Um registro conta como reidentificado quando todos os candidatos encontrados
+        pertencem ao titular correto.
+
+        Args:
+            anonymized_df (pd.DataFrame): Dataset pseudoanonimizado
+            auxiliary_df (pd.DataFrame): Base auxiliar com os valores originais
+            columns (list): Colunas pseudoanonimizadas conhecidas pelo atacante
+
+        Returns:
+            dict: Métricas do ataque
+        """
+        print(f"Simulando ataque de dicionário contra pseudônimos: {columns}")
+
+        hashed_aux = self.anonymizer.pseudonymization(auxiliary_df[[self.id_column] + columns], columns)
+        hashed_aux = hashed_aux.rename(columns={self.id_column: '_id_auxiliar'})
+
+        target = anonymized_df[[self.id_column] + columns].reset_index(drop=True)
+        target['_registro'] = np.arange(len(target))
+
+        pairs = target.merge(hashed_aux, on=columns, how='inner')
+        pairs['_acerto'] = pairs[self.id_column] == pairs['_id_auxiliar']
+
+        per_record = pairs.groupby('_registro')['_acerto'].all()
+
+        return self._report('pseudonimos', len(target), len(per_record), int(per_record.sum()), len(pairs))
+
+    def quasi_identifier_attack(self, anonymized_df, auxiliary_df, blocking_columns,
+                                numeric_columns=None, exact_columns=None):
+        """
+        Ataque por quasi-identificadores e atributos numéricos com ruído
+
+        Os pares candidatos são gerados por junção nas colunas de bloqueio. Cada par
+        recebe uma pontuação vetorizada: +1 para cada coluna exata igual e a
+        log-verossimilhança gaussiana da diferença padronizada de cada coluna numérica.
+        O candidato de maior pontuação é o vínculo escolhido pelo atacante.
+
+        Blocos da base auxiliar com mais de max_block_size registros são ignorados com
+        um aviso (as colunas de bloqueio são pouco seletivas), e os registros anonimizados
+        são divididos de forma que cada junção gere no máximo cerca de max_pairs pares.
+
+        Args:
+            anonymized_df (pd.DataFrame): Dataset anonimizado
+            auxiliary_df (pd.DataFrame): Base auxiliar
+            blocking_columns (list): Colunas que precisam coincidir exatamente (bloqueio)
+            numeric_columns (list): Colunas numéricas comparadas por distância
+            exact_columns (list): Colunas comparadas por igualdade fora do bloqueio
+
+        Returns:
+            dict: Métricas do ataque
+        """
+        numeric_columns = numeric_columns or []
+        exact_columns = exact_columns or []
+        compared = blocking_columns + numeric_columns + exact_columns
+        print(f"Simulando ataque por quasi-identificadores (bloqueio: {blocking_columns})")
+
+        aux = auxiliary_df[[self.id_column] + compared].rename(
+            columns={col: f'{col}_aux' for col in [self.id_column] + numeric_columns + exact_columns}
+        )
+        scales = {}
+        for col in numeric_columns:
+            std = auxiliary_df[col].std()
+            scales[col] = std if std and not pd.isna(std) else 1.0
+
+        # Tamanho de cada bloco da base auxiliar; blocos grandes demais são descartados
+        block_sizes = aux.groupby(blocking_columns).size().rename('_tamanho_bloco').reset_index()
+        oversized = block_sizes['_tamanho_bloco'] > self.max_block_size
+        if oversized.any():
+            print(f"Aviso: {int(oversized.sum())} blocos com mais de {self.max_block_size} registros "
+                  f"({int(block_sizes.loc[oversized, '_tamanho_bloco'].sum())} registros auxiliares) foram ignorados. "
+                  "Use colunas de bloqueio mais seletivas.")
+            block_sizes = block_sizes[~oversized]
+            aux = aux.merge(block_sizes[blocking_columns], on=blocking_columns, how='inner')
+
+        target = anonymized_df[[self.id_column] + compared].reset_index(drop=True)
+        target['_registro'] = np.arange(len(target))
+
+        # Dividir os registros de modo que cada junção gere no máximo ~max_pairs pares
+        expected_pairs = target[blocking_columns].merge(block_sizes, on=blocking_columns, how='left')
+        expected_pairs = expected_pairs['_tamanho_bloco'].fillna(0).to_numpy()
+        row_batches = np.arange(len(target)) // self.chunksize
+        pair_batches = np.cumsum(expected_pairs) // self.max_pairs
+        boundaries = (np.diff(row_batches) != 0) | (np.diff(pair_batches) != 0)
+        batch_ids = np.concatenate([[0], np.cumsum(boundaries)])[:len(target)]
+
+        linked = 0
+        correct = 0
+        candidate_pairs = 0
+
+        for _, chunk in target.groupby(batch_ids, sort=False):
+            pairs = chunk.merge(aux, on=blocking_columns, how='inner')
+            if pairs.empty:
+                continue
+            candidate_pairs += len(pairs)
+
+            score = np.zeros(len(pairs))
+            for col in exact_columns:
+                score += (pairs[col] == pairs[f'{col}_aux']).to_numpy()
+            for col in numeric_columns:
+                z = (pairs[col].astype(float) - pairs[f'{col}_aux'].astype(float)).to_numpy() / scales[col]
+                score -= 0.5 * np.nan_to_num(z, nan=np.inf) ** 2
+            pairs['_pontuacao'] = score
+
+            best = pairs.loc[pairs.groupby('_registro')['_pontuacao'].idxmax()]
+            linked += len(best)
+            correct += int((best[self.id_column] == best[f'{self.id_column}_aux']).sum())
+
+        return self._report('quasi_identificadores', len(target), linked, correct, candidate_pairs)
@@ -0,0 +1,181 @@
+"""
+Cache de Resultados de Anonimização
+Armazena em disco os resultados das técnicas, indexados pelo conteúdo do dataset
+e pelos parâmetros utilizados
+"""
+
+import os
+import json
+import sys
+import hashlib
+import inspect
+import importlib.util
+import pandas as pd
+
+# pyarrow só é importado quando uma entrada é gravada/lida, para não pesar na inicialização
+PARQUET_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+# Técnicas que usam números aleatórios: só entram no cache quando random_state é informado
+RANDOMIZED_TECHNIQUES = {'noise_addition', 'differential_privacy', 'synthetic_data'}
+
+# Módulos auxiliares cujo código também faz parte da versão de uma técnica
+TECHNIQUE_DEPENDENCIES = {'synthetic_data': ['synthetic_data']}
+
+
+class ResultCache:
+    """
+    Classe para armazenar resultados das técnicas de anonimização em disco
+
+    A chave de cada entrada combina a impressão digital do dataset (hash de cada coluna),
+    o nome da técnica, a versão do código que a implementa e os parâmetros. As entradas são salvas em Parquet (ou pickle, quando
+    o pyarrow não está disponível ou o dataset não pode ser convertido) e removidas por
+    ordem de último acesso quando o tamanho total ultrapassa o limite.
+    """
+
+    def __init__(self, cache_dir='.anonymization_cache', max_size_mb=1024):
+        """
+        Args:
+            cache_dir (str): Diretório onde as entradas são armazenadas
+            max_size_mb (int): Tamanho máximo do cache em MB
+        """
+        self.cache_dir = cache_dir
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self._code_versions = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(df):
+        """
+        Calcula a impressão digital de um DataFrame a partir do hash de cada coluna
+
+        Args:
+            df (pd.DataFrame): Dataset
+
+        Returns:
+            str: Hash hexadecimal do conteúdo, dos nomes e dos tipos das colunas
+        """
+        digest = hashlib.sha256()
+        digest.update(str(df.shape).encode())
+        for column in df.columns:
+            digest.update(f'{column}:{df[column].dtype}'.encode())
+            digest.update(pd.util.hash_pandas_object(df[column], index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def _code_version(self, anonymizer, technique):
+        """
+        Calcula a versão do código de uma técnica
+
+        Usa o código-fonte do módulo que define a classe do anonimizador (incluindo os
+        métodos auxiliares) e dos módulos listados em TECHNIQUE_DEPENDENCIES, de modo
+        que qualquer alteração nesse código invalida as entradas antigas.
+
+        Returns:
+            str: Hash hexadecimal do código-fonte
+        """
+        cache_key = (type(anonymizer), technique)
+        if cache_key not in self._code_versions:
+            modules = [sys.modules[type(anonymizer).__module__]]
+            modules += [sys.modules[name] for name in TECHNIQUE_DEPENDENCIES.get(technique, [])
+                        if name in sys.modules]
+            digest = hashlib.sha256()
+            for module in modules:
+                try:
+                    digest.update(inspect.getsource(module).encode())
+                except (OSError, TypeError):
+                    digest.update(module.__name__.encode())
+            self._code_versions[cache_key] = digest.hexdigest()
+        return self._code_versions[cache_key]
+
+    def _key(self, df, technique, params, code_version):
+        """Monta a chave da entrada a partir do dataset, da técnica, do código e dos parâmetros"""
+        payload = json.dumps({'tecnica': technique, 'versao': code_version, 'parametros': params},
+                             sort_keys=True, default=str)
+        return hashlib.sha256((self.fingerprint(df) + payload).encode()).hexdigest()
+
+    def _find(self, key):
+        """Retorna o caminho da entrada, se existir"""
+        for extension in ('.parquet', '.pkl'):
+            path = os.path.join(self.cache_dir, key + extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def load(self, key):
+        """
+        Carrega uma entrada do cache, atualizando seu horário de acesso
+
+        Returns:
+            pd.DataFrame: Resultado armazenado, ou None se não existir
+        """
+        path = self._find(key)
+        if path is None:
+            return None
+
+        os.utime(path)
+        if path.endswith('.parquet'):
+            return pd.read_parquet(path)
+        return pd.read_pickle(path)
+
+    def store(self, key, df):
+        """Salva uma entrada no cache e aplica o limite de tamanho"""
+        path = os.path.join(self.cache_dir, key + '.parquet')
+        stored = False
+        if PARQUET_AVAILABLE:
+            import pyarrow
+            try:
+                df.to_parquet(path, index=True)
+                stored = True
+            except (ValueError, TypeError, pyarrow.ArrowException):
+                if os.path.exists(path):
+                    os.remove(path)
+        if not stored:
+            df.to_pickle(os.path.join(self.cache_dir, key + '.pkl'))
+
+        self._evict()
+
+    def _evict(self):
+        """Remove as entradas acessadas há mais tempo até respeitar o tamanho máximo"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.endswith(('.parquet', '.pkl')):
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            os.remove(path)
+            total_size -= size
+
+    def run(self, anonymizer, technique, df, *args, **kwargs):
+        """
+        Executa uma técnica do DataAnonymizer usando o cache quando possível
+
+        Técnicas determinísticas são sempre armazenadas. Técnicas aleatórias só são
+        armazenadas quando executadas com random_state.
+
+        Args:
+            anonymizer (DataAnonymizer): Instância que implementa a técnica
+            technique (str): Nome do método (ex.: 'k_anonymity')
+            df (pd.DataFrame): Dataset original
+            *args, **kwargs: Parâmetros repassados para a técnica
+
+        Returns:
+            pd.DataFrame: Dataset anonimizado
+        """
+        method = getattr(anonymizer, technique)
+
+        if technique in RANDOMIZED_TECHNIQUES and kwargs.get('random_state') is None:
+            return method(df, *args, **kwargs)
+
+        key = self._key(df, technique, {'args': args, 'kwargs': kwargs}, self._code_version(anonymizer, technique))
+        cached = self.load(key)
+        if cached is not None:
+            print(f"Resultado carregado do cache: {technique}")
+            return cached
+
+        result = method(df, *args, **kwargs)
+        self.store(key, result)
+        return result
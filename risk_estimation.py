@@ -0,0 +1,176 @@
+"""
+Estimativa Rápida de Risco de Reidentificação
+Estima, a partir de uma amostra, o efeito da k-anonimidade sem processar o dataset inteiro
+"""
+
+import numpy as np
+import pandas as pd
+from anonymization_techniques import DataAnonymizer
+
+# Nível de confiança dos intervalos e quantil correspondente da normal padrão
+CONFIDENCE = 0.95
+Z_95 = 1.96
+
+# Constantes do misturador splitmix64
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_COMBINE = np.uint64(0x100000001B3)
+
+
+def _splitmix64(values):
+    """Mistura os bits de um array uint64 (finalizador splitmix64)"""
+    z = values + _GOLDEN
+    z = (z ^ (z >> np.uint64(30))) * _MIX_1
+    z = (z ^ (z >> np.uint64(27))) * _MIX_2
+    return z ^ (z >> np.uint64(31))
+
+
+class RiskEstimator:
+    """
+    Classe para estimar rapidamente o resultado da k-anonimidade
+
+    A amostra é feita por classe de equivalência: o hash da tupla de quasi-identificadores
+    decide se a classe inteira entra na amostra. Assim, o tamanho de cada classe amostrada
+    é exato e os totais podem ser estimados sem viés (estimador de Horvitz-Thompson).
+    Os hashes de cada coluna são calculados uma única vez, de modo que avaliar uma nova
+    combinação de k, quasi-identificadores ou regras de generalização custa apenas
+    operações vetorizadas sobre arrays de inteiros.
+    """
+
+    def __init__(self, df, sample_rate=0.01, seed=0):
+        """
+        Args:
+            df (pd.DataFrame): Dataset original
+            sample_rate (float): Fração das classes de equivalência incluídas na amostra
+            seed (int): Semente que define quais classes são amostradas
+        """
+        self.df = df
+        self.n_records = len(df)
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.seed = np.uint64(seed)
+        self.anonymizer = DataAnonymizer()
+        self._column_hashes = {}
+
+    def _column_hash(self, column, rule=None):
+        """
+        Retorna (e armazena em cache) o hash de cada valor de uma coluna
+
+        Args:
+            column (str): Nome da coluna
+            rule (dict): Regra de generalização aplicada antes do hash (opcional)
+
+        Returns:
+            np.ndarray: Hashes uint64 de cada registro
+        """
+        cache_key = (column, rule['type'] if rule else None)
+        if cache_key not in self._column_hashes:
+            values = self.df[[column]]
+            if rule:
+                values = self.anonymizer.generalization(values, {column: rule})
+            self._column_hashes[cache_key] = pd.util.hash_pandas_object(
+                values[column], index=False
+            ).to_numpy()
+        return self._column_hashes[cache_key]
+
+    def _class_sizes(self, quasi_identifiers, generalization_rules=None):
+        """
+        Calcula os tamanhos das classes de equivalência amostradas
+
+        Returns:
+            np.ndarray: Tamanho de cada classe presente na amostra
+        """
+        generalization_rules = generalization_rules or {}
+
+        combined = np.zeros(self.n_records, dtype=np.uint64)
+        for column in quasi_identifiers:
+            combined = combined * _COMBINE + self._column_hash(column, generalization_rules.get(column))
+        mixed = _splitmix64(combined ^ self.seed)
+
+        if self.sample_rate < 1.0:
+            threshold = np.uint64(int(self.sample_rate * 2 ** 64))
+            mixed = mixed[mixed < threshold]
+
+        _, sizes = np.unique(mixed, return_counts=True)
+        return sizes
+
+    def _horvitz_thompson(self, values, unit=1):
+        """
+        Estima um total populacional e seu intervalo de confiança de 95%
+
+        Quando nenhuma classe amostrada contribui, a variância estimada é zero e o
+        intervalo normal colapsaria em um ponto. Nesse caso o limite superior usa o
+        número máximo de classes não observadas compatível com 95% de confiança
+        (ln(0,05) / ln(1 - p), a "regra de três" para amostragem de Bernoulli).
+
+        Args:
+            values (np.ndarray): Contribuição de cada classe amostrada
+            unit (float): Contribuição máxima plausível de uma classe não observada
+
+        Returns:
+            tuple: (estimativa, limite inferior, limite superior)
+        """
+        p = self.sample_rate
+        estimate = values.sum() / p
+        variance = (1 - p) / p ** 2 * np.square(values, dtype=np.float64).sum()
+        margin = Z_95 * np.sqrt(variance)
+        upper = estimate + margin
+        if not values.any() and p < 1.0:
+            upper = unit * np.log(1 - CONFIDENCE) / np.log(1 - p)
+        return float(estimate), float(max(estimate - margin, 0.0)), float(upper)
+
+    def estimate(self, quasi_identifiers, k=3, generalization_rules=None):
+        """
+        Estima o efeito da k-anonimidade para uma combinação de parâmetros
+
+        Args:
+            quasi_identifiers (list): Lista de atributos quasi-identificadores
+            k (int): Valor mínimo de k para anonimidade
+            generalization_rules (dict): Regras de generalização no formato de DataAnonymizer.generalization
+
+        Returns:
+            dict: Estimativas com intervalos de confiança de 95% (tuplas estimativa, inferior, superior)
+        """
+        available_columns = [col for col in quasi_identifiers if col in self.df.columns]
+        if not available_columns or self.sample_rate == 0.0:
+            return None
+
+        sizes = self._class_sizes(available_columns, generalization_rules)
+        below_k = sizes < k
+
+        retained = self._horvitz_thompson(np.where(below_k, 0, sizes), unit=max(k, sizes.max(initial=0)))
+        unique = self._horvitz_thompson((sizes == 1).astype(np.int64))
+
+        return {
+            'quasi_identificadores': available_columns,
+            'k': k,
+            'registros_mantidos': tuple(min(v, self.n_records) for v in retained),
+            'classes': self._horvitz_thompson(np.ones_like(sizes)),
+            'classes_abaixo_de_k': self._horvitz_thompson(below_k.astype(np.int64)),
+            'unicidade': tuple(min(v / self.n_records, 1.0) for v in unique)
+        }
+
+    def sweep(self, quasi_identifier_sets, k_values, generalization_rules=None):
+        """
+        Avalia várias combinações de quasi-identificadores e valores de k
+
+        Args:
+            quasi_identifier_sets (list): Lista de listas de quasi-identificadores
+            k_values (list): Valores de k a testar
+            generalization_rules (dict): Regras de generalização aplicadas em todas as combinações
+
+        Returns:
+            pd.DataFrame: Uma linha por combinação, com estimativas pontuais e intervalos
+        """
+        rows = []
+        for quasi_identifiers in quasi_identifier_sets:
+            for k in k_values:
+                result = self.estimate(quasi_identifiers, k, generalization_rules)
+                if result is None:
+                    continue
+                row = {'quasi_identificadores': ', '.join(result['quasi_identificadores']), 'k': k}
+                for metric in ['registros_mantidos', 'classes_abaixo_de_k', 'unicidade']:
+                    row[metric], row[f'{metric}_inf'], row[f'{metric}_sup'] = result[metric]
+                rows.append(row)
+
+        return pd.DataFrame(rows)
@@ -5,12 +5,19 @@ Simula um dataset com informações pessoais sensíveis conforme LGPD
 
 import pandas as pd
 import numpy as np
-from faker import Faker
 import random
 from datetime import datetime, timedelta
 
-# Configurar Faker para português brasileiro
-fake = Faker('pt_BR')
+# Instância do Faker criada sob demanda (a importação e a configuração do locale são lentas)
+_fake = None
+
+def _get_faker():
+    """Retorna a instância do Faker configurada para português brasileiro"""
+    global _fake
+    if _fake is None:
+        from faker import Faker
+        _fake = Faker('pt_BR')
+    return _fake
 
 def generate_sensitive_dataset(n_records=1000):
     """
@@ -23,6 +30,7 @@ def generate_sensitive_dataset(n_records=1000):
         pd.DataFrame: Dataset com dados sensíveis
     """
     
+    fake = _get_faker()
     data = []
     
     for _ in range(n_records):
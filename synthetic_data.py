@@ -0,0 +1,387 @@
+"""
+Geração de Dados Sintéticos
+Ajusta um modelo compacto (marginais + cópula gaussiana) ao dataset original e gera
+registros sintéticos que preservam distribuições e correlações sem reaproveitar registros reais
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+# Coeficientes da aproximação de Acklam para a inversa da normal padrão
+_PPF_A = [-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+          1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00]
+_PPF_B = [-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+          6.680131188771972e+01, -1.328068155288572e+01]
+_PPF_C = [-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+          -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00]
+_PPF_D = [7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+          3.754408661907416e+00]
+_PPF_LOW = 0.02425
+
+# Limite dos escores normais na correlação com privacidade diferencial (define a sensibilidade)
+SCORE_CLIP = 3.0
+
+
+def _norm_cdf(x):
+    """Função de distribuição da normal padrão (aproximação de Abramowitz-Stegun para erf)"""
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+def _norm_ppf(p):
+    """Inversa da função de distribuição da normal padrão (algoritmo de Acklam)"""
+    p = np.clip(np.asarray(p, dtype=float), 1e-12, 1 - 1e-12)
+    result = np.empty_like(p)
+
+    low = p < _PPF_LOW
+    high = p > 1 - _PPF_LOW
+    mid = ~(low | high)
+
+    q = np.sqrt(-2 * np.log(np.where(low, p, 1 - p)))
+    tail = (((((_PPF_C[0] * q + _PPF_C[1]) * q + _PPF_C[2]) * q + _PPF_C[3]) * q + _PPF_C[4]) * q + _PPF_C[5]) / \
+           ((((_PPF_D[0] * q + _PPF_D[1]) * q + _PPF_D[2]) * q + _PPF_D[3]) * q + 1)
+    result[low] = tail[low]
+    result[high] = -tail[high]
+
+    q = p[mid] - 0.5
+    r = q * q
+    result[mid] = (((((_PPF_A[0] * r + _PPF_A[1]) * r + _PPF_A[2]) * r + _PPF_A[3]) * r + _PPF_A[4]) * r + _PPF_A[5]) * q / \
+                  (((((_PPF_B[0] * r + _PPF_B[1]) * r + _PPF_B[2]) * r + _PPF_B[3]) * r + _PPF_B[4]) * r + 1)
+    return result
+
+
+def _nearest_correlation(matrix):
+    """Projeta uma matriz simétrica na matriz de correlação positiva definida mais próxima"""
+    matrix = np.nan_to_num((matrix + matrix.T) / 2)
+    eigenvalues, eigenvectors = np.linalg.eigh(matrix)
+    matrix = eigenvectors @ np.diag(np.clip(eigenvalues, 1e-6, None)) @ eigenvectors.T
+    scale = np.sqrt(np.diag(matrix))
+    return matrix / np.outer(scale, scale)
+
+
+class GaussianCopulaSynthesizer:
+    """
+    Classe para ajustar um modelo de cópula gaussiana e gerar dados sintéticos
+
+    O ajuste é feito em uma única passagem pelos dados (DataFrame ou iterador de chunks):
+    contagens exatas das categorias, mínimo/máximo exatos das colunas numéricas e uma
+    amostra de reservatório de tamanho fixo, usada para os quantis numéricos e para a
+    matriz de correlação da cópula. O modelo resultante é compacto e independente do
+    tamanho do dataset original. Com epsilon, as marginais vêm de histogramas com ruído
+    de Laplace sobre domínios públicos e a correlação de somas com ruído, garantindo
+    privacidade diferencial ε para o modelo (e para os dados gerados a partir dele).
+    """
+
+    def __init__(self, reservoir_size=10000, n_quantiles=101):
+        """
+        Args:
+            reservoir_size (int): Registros mantidos na amostra de reservatório
+            n_quantiles (int): Pontos da grade de quantis de cada coluna numérica
+        """
+        self.reservoir_size = reservoir_size
+        self.n_quantiles = n_quantiles
+        self.columns = []
+        self.numeric_columns = []
+        self.integer_columns = []
+        self.n_records = 0
+        self.quantiles = {}
+        self.categories = {}
+        self.correlation = None
+
+    def fit(self, data, columns=None, epsilon=None, domains=None, random_state=None):
+        """
+        Ajusta o modelo em uma única passagem
+
+        Args:
+            data (pd.DataFrame ou iterável de pd.DataFrame): Dataset original ou chunks
+                (ex.: pd.read_csv(caminho, chunksize=100000))
+            columns (list): Colunas modeladas (padrão: todas do primeiro chunk)
+            epsilon (float): Se informado, ajusta o modelo com privacidade diferencial ε
+                (metade do orçamento para as marginais, dividida entre as colunas, e metade
+                para a correlação). O número de registros e o esquema são tratados como públicos
+            domains (dict): Domínios públicos das colunas, obrigatórios com epsilon:
+                (mínimo, máximo) para colunas numéricas e lista de categorias para as demais
+            random_state (int ou np.random.SeedSequence): Semente da amostra de reservatório e do ruído
+
+        Returns:
+            GaussianCopulaSynthesizer: O próprio modelo ajustado
+        """
+        rng = np.random.default_rng(random_state)
+        chunks = [data] if isinstance(data, pd.DataFrame) else data
+
+        self.n_records = 0
+        self.quantiles = {}
+        self.categories = {}
+
+        reservoir = None
+        reservoir_keys = np.empty(0)
+        category_counts = {}
+        histograms = {}
+        minimums = {}
+        maximums = {}
+
+        for chunk in chunks:
+            if reservoir is None:
+                self.columns = [col for col in (columns or chunk.columns) if col in chunk.columns]
+                self.numeric_columns = [
+                    col for col in self.columns
+                    if pd.api.types.is_numeric_dtype(chunk[col]) and not pd.api.types.is_bool_dtype(chunk[col])
+                ]
+                self.integer_columns = [col for col in self.numeric_columns
+                                        if pd.api.types.is_integer_dtype(chunk[col])]
+                if epsilon is not None:
+                    self._check_domains(epsilon, domains)
+            chunk = chunk[self.columns]
+            self.n_records += len(chunk)
+
+            for col in self.columns:
+                if col not in self.numeric_columns:
+                    counts = chunk[col].value_counts()
+                    category_counts[col] = counts if col not in category_counts else \
+                        category_counts[col].add(counts, fill_value=0)
+                elif epsilon is None:
+                    minimums[col] = np.nanmin([minimums.get(col, np.nan), chunk[col].min()])
+                    maximums[col] = np.nanmax([maximums.get(col, np.nan), chunk[col].max()])
+                else:
+                    # Histograma sobre os limites públicos; valores fora deles vão para os extremos
+                    low, high = domains[col]
+                    values = np.clip(chunk[col].dropna().to_numpy(dtype=float), low, high)
+                    counts = np.histogram(values, bins=np.linspace(low, high, self.n_quantiles))[0]
+                    histograms[col] = histograms.get(col, 0) + counts
+
+            # Amostra de reservatório: manter os registros com as menores chaves aleatórias
+            keys = rng.random(len(chunk))
+            combined = chunk if reservoir is None else pd.concat([reservoir, chunk], ignore_index=True)
+            combined_keys = np.concatenate([reservoir_keys, keys])
+            if len(combined) > self.reservoir_size:
+                keep = np.argpartition(combined_keys, self.reservoir_size - 1)[:self.reservoir_size]
+                combined = combined.iloc[keep].reset_index(drop=True)
+                combined_keys = combined_keys[keep]
+            reservoir, reservoir_keys = combined.reset_index(drop=True), combined_keys
+
+        if reservoir is None or len(reservoir) == 0:
+            raise ValueError("Nenhum registro disponível para ajustar o modelo")
+
+        if epsilon is None:
+            self._fit_exact(reservoir, category_counts, minimums, maximums)
+        else:
+            self._fit_private(reservoir, category_counts, histograms, epsilon, domains, rng)
+
+        print(f"Modelo ajustado: {self.n_records} registros, {len(self.columns)} colunas"
+              + (f", privacidade diferencial epsilon={epsilon}" if epsilon is not None else ""))
+        return self
+
+    def _check_domains(self, epsilon, domains):
+        """Valida epsilon e os domínios públicos exigidos pelo ajuste com privacidade diferencial"""
+        if epsilon <= 0:
+            raise ValueError("epsilon deve ser positivo")
+        domains = domains or {}
+        missing = [col for col in self.columns if col not in domains]
+        if missing:
+            raise ValueError(f"Com epsilon, informe o domínio público das colunas: {missing}")
+        for col in self.columns:
+            if col in self.numeric_columns:
+                low, high = domains[col]
+                if not low < high:
+                    raise ValueError(f"Domínio inválido para {col}: mínimo deve ser menor que o máximo")
+            elif len(domains[col]) == 0:
+                raise ValueError(f"Domínio inválido para {col}: informe ao menos uma categoria")
+
+    def _fit_exact(self, reservoir, category_counts, minimums, maximums):
+        """Ajusta marginais e correlação sem ruído, descartando colunas totalmente nulas"""
+        # Colunas sem nenhum valor não nulo não têm distribuição a modelar
+        empty = [col for col in self.columns
+                 if (col in self.numeric_columns and pd.isna(minimums[col]))
+                 or (col not in self.numeric_columns and len(category_counts[col]) == 0)]
+        if empty:
+            print(f"Colunas sem valores não nulos descartadas do modelo: {empty}")
+            self.columns = [col for col in self.columns if col not in empty]
+            self.numeric_columns = [col for col in self.numeric_columns if col not in empty]
+            self.integer_columns = [col for col in self.integer_columns if col not in empty]
+            reservoir = reservoir[self.columns]
+        if not self.columns:
+            raise ValueError("Nenhuma coluna com valores não nulos para ajustar o modelo")
+
+        # Marginais: quantis da amostra com os extremos exatos
+        probabilities = np.linspace(0, 1, self.n_quantiles)
+        for col in self.numeric_columns:
+            grid = np.nanquantile(reservoir[col].to_numpy(dtype=float), probabilities)
+            grid[0], grid[-1] = minimums[col], maximums[col]
+            self.quantiles[col] = grid
+
+        for col in self.columns:
+            if col in self.numeric_columns:
+                continue
+            counts = category_counts[col].sort_values(ascending=False)
+            values = counts.to_numpy(dtype=float)
+            self.categories[col] = (counts.index.to_numpy(), np.cumsum(values) / values.sum())
+
+        # Correlação da cópula a partir dos escores normais (postos) da amostra
+        scores = np.column_stack([self._normal_scores(reservoir[col], col) for col in self.columns])
+        correlation = np.corrcoef(scores, rowvar=False) if len(self.columns) > 1 else np.ones((1, 1))
+        correlation = np.atleast_2d(np.nan_to_num(correlation))
+        np.fill_diagonal(correlation, 1.0)
+        self.correlation = _nearest_correlation(correlation)
+
+    def _fit_private(self, reservoir, category_counts, histograms, epsilon, domains, rng):
+        """
+        Ajusta marginais e correlação com privacidade diferencial ε (mecanismo de Laplace)
+
+        - Marginais: cada registro altera uma única contagem do histograma (numéricas, sobre
+          os limites públicos) ou da frequência das categorias do domínio público, portanto a
+          sensibilidade é 1 por coluna, com ε/2 dividido igualmente entre as colunas.
+        - Correlação: os escores normais são calculados com as marginais já privadas e
+          limitados a ±SCORE_CLIP. As somas dos produtos na amostra de reservatório recebem
+          ruído com o restante do orçamento; a sensibilidade considera que incluir um registro
+          na amostra pode retirar outro (2·SCORE_CLIP² por soma).
+        """
+        n_columns = len(self.columns)
+        epsilon_correlation = epsilon / 2 if n_columns > 1 else 0.0
+        epsilon_column = (epsilon - epsilon_correlation) / n_columns
+
+        # Marginais a partir das contagens com ruído (o piso mínimo mantém a distribuição acumulada crescente)
+        probabilities = np.linspace(0, 1, self.n_quantiles)
+        for col in self.numeric_columns:
+            low, high = domains[col]
+            counts = histograms.get(col, np.zeros(self.n_quantiles - 1))
+            counts = np.clip(counts + rng.laplace(0, 1 / epsilon_column, len(counts)), 0, None) + 1e-9
+            cumulative = np.concatenate([[0.0], np.cumsum(counts) / counts.sum()])
+            self.quantiles[col] = np.interp(probabilities, cumulative, np.linspace(low, high, self.n_quantiles))
+
+        for col in self.columns:
+            if col in self.numeric_columns:
+                continue
+            categories = list(domains[col])
+            counts = category_counts[col].reindex(categories, fill_value=0).to_numpy(dtype=float)
+            counts = np.clip(counts + rng.laplace(0, 1 / epsilon_column, len(counts)), 0, None) + 1e-9
+            self.categories[col] = (np.array(categories, dtype=object), np.cumsum(counts) / counts.sum())
+
+        if n_columns == 1:
+            self.correlation = np.ones((1, 1))
+            return
+
+        # Correlação a partir das somas com ruído dos produtos dos escores limitados
+        scores = np.column_stack([self._normal_scores(reservoir[col], col, ranks=False) for col in self.columns])
+        scores = np.clip(scores, -SCORE_CLIP, SCORE_CLIP)
+        sensitivity = SCORE_CLIP ** 2 * n_columns * (n_columns + 1)
+        noise = np.triu(rng.laplace(0, sensitivity / epsilon_correlation, (n_columns, n_columns)))
+        sums = scores.T @ scores + noise + np.triu(noise, 1).T
+        scale = np.sqrt(np.clip(np.diag(sums), 1e-9, None))
+        correlation = np.clip(sums / np.outer(scale, scale), -1, 1)
+        np.fill_diagonal(correlation, 1.0)
+        self.correlation = _nearest_correlation(correlation)
+
+    def _normal_scores(self, series, column, ranks=True):
+        """
+        Converte os valores de uma coluna em escores normais (valores ausentes viram 0)
+
+        Colunas numéricas usam os postos da amostra (ranks=True) ou a marginal ajustada,
+        que não depende dos demais registros (ranks=False, usado com privacidade diferencial).
+        """
+        if column in self.numeric_columns:
+            if ranks:
+                u = series.rank(method='average').to_numpy(dtype=float) / (series.notna().sum() + 1)
+            else:
+                u = np.interp(series.to_numpy(dtype=float), self.quantiles[column],
+                              np.linspace(0, 1, self.n_quantiles))
+            return np.nan_to_num(_norm_ppf(np.nan_to_num(u, nan=0.5)))
+
+        categories, cumulative = self.categories[column]
+        upper = pd.Series(cumulative, index=categories)
+        lower = pd.Series(np.concatenate([[0.0], cumulative[:-1]]), index=categories)
+        u = ((series.map(lower) + series.map(upper)) / 2).to_numpy(dtype=float)
+        return _norm_ppf(np.nan_to_num(u, nan=0.5))
+
+    def _sample_batch(self, n_records, seed):
+        """
+        Gera um lote de registros sintéticos
+
+        Args:
+            n_records (int): Número de registros do lote
+            seed (np.random.SeedSequence): Semente independente do lote
+
+        Returns:
+            pd.DataFrame: Lote sintético
+        """
+        rng = np.random.default_rng(seed)
+        cholesky = np.linalg.cholesky(self.correlation)
+        u = _norm_cdf(rng.standard_normal((n_records, len(self.columns))) @ cholesky.T)
+
+        batch = {}
+        probabilities = np.linspace(0, 1, self.n_quantiles)
+        for i, col in enumerate(self.columns):
+            if col in self.numeric_columns:
+                values = np.interp(u[:, i], probabilities, self.quantiles[col])
+                batch[col] = np.round(values).astype(int) if col in self.integer_columns else np.round(values, 2)
+            else:
+                categories, cumulative = self.categories[col]
+                index = np.minimum(np.searchsorted(cumulative, u[:, i], side='right'), len(categories) - 1)
+                batch[col] = categories[index]
+
+        return pd.DataFrame(batch, columns=self.columns)
+
+    def _batches(self, n_records, batch_size, random_state):
+        """Divide a geração em lotes com sementes independentes"""
+        sizes = [batch_size] * (n_records // batch_size)
+        if n_records % batch_size:
+            sizes.append(n_records % batch_size)
+        if not isinstance(random_state, np.random.SeedSequence):
+            random_state = np.random.SeedSequence(random_state)
+        seeds = random_state.spawn(len(sizes))
+        return list(zip(sizes, seeds))
+
+    def sample(self, n_records, batch_size=100000, n_jobs=None, random_state=None):
+        """
+        Gera registros sintéticos em lotes vetorizados e paralelos
+
+        Args:
+            n_records (int): Número de registros sintéticos
+            batch_size (int): Registros por lote
+            n_jobs (int): Número de threads (padrão: definido pelo executor)
+            random_state (int ou np.random.SeedSequence): Semente para tornar a geração reprodutível
+
+        Returns:
+            pd.DataFrame: Dataset sintético
+        """
+        if self.correlation is None:
+            raise ValueError("O modelo precisa ser ajustado com fit antes da geração")
+
+        batches = self._batches(n_records, batch_size, random_state)
+        if not batches:
+            return pd.DataFrame(columns=self.columns)
+
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            frames = list(executor.map(lambda args: self._sample_batch(*args), batches))
+        return pd.concat(frames, ignore_index=True)
+
+    def sample_to_csv(self, path, n_records, batch_size=100000, n_jobs=None, random_state=None):
+        """
+        Gera registros sintéticos diretamente em um CSV, sem manter o dataset inteiro em memória
+
+        Args:
+            path (str): Caminho do CSV de saída
+            n_records (int): Número de registros sintéticos
+            batch_size (int): Registros por lote
+            n_jobs (int): Número de threads (padrão: definido pelo executor)
+            random_state (int ou np.random.SeedSequence): Semente para tornar a geração reprodutível
+        """
+        if self.correlation is None:
+            raise ValueError("O modelo precisa ser ajustado com fit antes da geração")
+
+        pd.DataFrame(columns=self.columns).to_csv(path, index=False, encoding='utf-8')
+        batches = self._batches(n_records, batch_size, random_state)
+
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            # Processar em janelas para limitar quantos lotes ficam em memória
+            window = 2 * (n_jobs or os.cpu_count() or 1)
+            for start in range(0, len(batches), window):
+                frames = executor.map(lambda args: self._sample_batch(*args), batches[start:start + window])
+                for frame in frames:
+                    frame.to_csv(path, mode='a', header=False, index=False, encoding='utf-8')
+
+        print(f"Arquivo salvo: {path} ({n_records} registros sintéticos)")